@@ -0,0 +1,122 @@
+"""Character creation and the on-disk character sheet store.
+
+Character sheets live as one YAML file per character under the characters
+directory so they can be hand-edited between sessions.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from game.models import Character
+
+DEFAULT_CHARACTERS_DIR = os.path.join("data", "characters")
+
+
+class CharacterBuilder:
+    """Creates, saves and loads character sheets."""
+
+    def __init__(self, characters_dir: str = DEFAULT_CHARACTERS_DIR):
+        self.characters_dir = characters_dir
+        os.makedirs(self.characters_dir, exist_ok=True)
+        self._list_cache = None
+
+    def create_character(
+        self,
+        name: str,
+        ancestry: str = "human",
+        char_class: str = "wanderer",
+        stats: Optional[Dict[str, int]] = None,
+        skills: Optional[Dict[str, int]] = None,
+        portrait: Optional[str] = None,
+        notes: str = "",
+    ) -> Character:
+        """Build a new character and persist it to disk."""
+        stats = stats or {}
+        hp = 8 + (stats.get("CON", 10) - 10) // 2
+        character = Character(
+            name=name,
+            ancestry=ancestry,
+            char_class=char_class,
+            hp=max(hp, 1),
+            stats=stats,
+            skills=skills or {},
+            portrait=portrait,
+            notes=notes,
+        )
+        self.save_character(character)
+        return character
+
+    def save_character(self, character: Character) -> str:
+        """Write a character sheet to its YAML file, returning the path."""
+        path = self._character_path(character.name)
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(character.model_dump(), f, sort_keys=False)
+        self._list_cache = None
+        return path
+
+    def list_characters(self) -> List[Dict[str, Any]]:
+        """Return summary dicts (name, ancestry, class, level) for every sheet.
+
+        The listing is memoized on the directory mtime so repeated renders
+        of the roster do not re-scan and re-parse every sheet.
+        """
+        try:
+            mtime = os.stat(self.characters_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._list_cache is not None and self._list_cache[0] == mtime:
+            return self._list_cache[1]
+        summaries = []
+        for filename in sorted(os.listdir(self.characters_dir)):
+            if not filename.endswith((".yaml", ".yml")):
+                continue
+            path = os.path.join(self.characters_dir, filename)
+            with open(path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            summaries.append(
+                {
+                    "name": data.get("name", filename.rsplit(".", 1)[0]),
+                    "ancestry": data.get("ancestry", ""),
+                    "char_class": data.get("char_class", ""),
+                    "level": data.get("level", 1),
+                }
+            )
+        self._list_cache = (mtime, summaries)
+        return summaries
+
+    def get_first_character(self) -> Optional[Character]:
+        """Load the first character sheet in one directory pass.
+
+        Avoids the list-then-get double read callers otherwise do when any
+        character will serve.
+        """
+        for filename in sorted(os.listdir(self.characters_dir)):
+            if filename.endswith((".yaml", ".yml")):
+                path = os.path.join(self.characters_dir, filename)
+                with open(path, "r", encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+                return Character.model_validate(data)
+        return None
+
+    def get_character(self, name: str) -> Optional[Character]:
+        """Load a full character sheet by name, or None when missing."""
+        path = self._character_path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        return Character.model_validate(data)
+
+    def delete_character(self, name: str) -> bool:
+        path = self._character_path(name)
+        if os.path.exists(path):
+            os.remove(path)
+            self._list_cache = None
+            return True
+        return False
+
+    def _character_path(self, name: str) -> str:
+        safe = "".join(c for c in name if c.isalnum() or c in ("-", "_", " ")).strip()
+        return os.path.join(self.characters_dir, f"{safe.replace(' ', '_').lower()}.yaml")
@@ -0,0 +1,86 @@
+"""A small turn-based combat engine."""
+
+import random
+from typing import Any, Dict, List, Optional
+
+from game.models import Character
+from rules.loader import Ruleset
+
+
+class CombatEngine:
+    """Tracks one active combat at a time and resolves actions."""
+
+    def __init__(self, ruleset: Optional[Ruleset] = None):
+        self.ruleset = ruleset
+        self.state: Dict[str, Any] = {"active": False}
+
+    def start_combat(
+        self, character: Character, enemies: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Begin a combat between ``character`` and ``enemies``."""
+        combatants = [
+            {
+                "name": character.name,
+                "side": "party",
+                "hp": character.hp,
+                "max_hp": character.hp,
+                "defense": 10 + (character.stats.get("DEX", 10) - 10) // 2,
+                "effects": [],
+            }
+        ]
+        for enemy in enemies:
+            combatants.append(
+                {
+                    "name": enemy.get("name", "enemy"),
+                    "side": "enemies",
+                    "hp": enemy.get("hp", 5),
+                    "max_hp": enemy.get("hp", 5),
+                    "defense": enemy.get("defense", 10),
+                    "effects": [],
+                }
+            )
+        self.state = {
+            "active": True,
+            "round": 1,
+            "turn": combatants[0]["name"],
+            "combatants": combatants,
+            "log": [f"Combat begins: {character.name} faces {len(enemies)} foe(s)."],
+        }
+        return self.state
+
+    def resolve_action(self, actor: str, action: str, target: Optional[str] = None) -> Dict[str, Any]:
+        """Resolve one action and advance the round."""
+        if not self.state.get("active"):
+            return self.state
+        log = self.state["log"]
+        if action == "attack" and target:
+            roll = random.randint(1, 20)
+            victim = self._find(target)
+            if victim is not None and roll >= victim["defense"]:
+                damage = random.randint(1, 6)
+                victim["hp"] -= damage
+                log.append(f"{actor} hits {target} for {damage} (rolled {roll}).")
+                if victim["hp"] <= 0:
+                    log.append(f"{target} falls!")
+            else:
+                log.append(f"{actor} misses {target} (rolled {roll}).")
+        elif action == "flee":
+            log.append(f"{actor} flees the fight.")
+            self.state["active"] = False
+        else:
+            log.append(f"{actor} hesitates.")
+        self.state["round"] += 1
+        if not any(c["hp"] > 0 for c in self.state["combatants"] if c["side"] == "enemies"):
+            self.state["active"] = False
+            log.append("The field falls quiet.")
+        return self.state
+
+    def end_combat(self) -> Dict[str, Any]:
+        self.state = {"active": False}
+        return self.state
+
+    def _find(self, name: str) -> Optional[Dict[str, Any]]:
+        for combatant in self.state.get("combatants", []):
+            if combatant["name"] == name:
+                return combatant
+        return None
@@ -0,0 +1,59 @@
+"""Core data models shared across the host."""
+
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Character(BaseModel):
+    """A player or host-controlled character sheet."""
+
+    name: str
+    ancestry: str = "human"
+    char_class: str = "wanderer"
+    level: int = 1
+    hp: int = 10
+    stats: Dict[str, int] = Field(default_factory=dict)
+    skills: Dict[str, int] = Field(default_factory=dict)
+    portrait: Optional[str] = None
+    notes: str = ""
+
+
+class WorldLocation(BaseModel):
+    """A place the party can visit."""
+
+    name: str
+    description: str = ""
+    discovered: bool = False
+    connections: Dict[str, str] = Field(default_factory=dict)
+    features: Dict[str, Any] = Field(default_factory=dict)
+
+
+class WorldState(BaseModel):
+    """The full mutable state of a campaign world.
+
+    A ``WorldState`` is what the :class:`persistence.save_manager.SaveManager`
+    snapshots on every save; everything the host needs to resume a session
+    lives here.
+    """
+
+    campaign_id: str
+    name: str = "Untitled Campaign"
+    version: int = 0
+    timestamp: Optional[str] = None
+    characters: Dict[str, Character] = Field(default_factory=dict)
+    locations: Dict[str, WorldLocation] = Field(default_factory=dict)
+    world_flags: Dict[str, Any] = Field(default_factory=dict)
+    current_location: Optional[str] = None
+
+    def add_character(self, character: Character) -> None:
+        # Stored as the model itself: dumping to a dict here only to have
+        # model_dump_json re-serialize it on every save is double work, and
+        # pydantic validates nested models recursively on load anyway.
+        self.characters[character.name] = character
+
+    def add_location(self, location: WorldLocation) -> None:
+        self.locations[location.name] = location
+
+    def set_flag(self, key: str, value: Any) -> None:
+        self.world_flags[key] = value
@@ -0,0 +1,67 @@
+"""Lore element models.
+
+Every piece of campaign lore is a :class:`LoreElement`; the concrete
+subclasses add fields specific to one :class:`LoreType`.
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class LoreType(str, Enum):
+    NPC = "npc"
+    LOCATION = "location"
+    FACTION = "faction"
+    ITEM = "item"
+    EVENT = "event"
+    JOURNAL_ENTRY = "journal_entry"
+
+
+class LoreElement(BaseModel):
+    """Base class for everything stored in the lore database."""
+
+    id: str
+    campaign_id: str
+    lore_type: LoreType
+    name: str
+    description: str = ""
+    tags: List[str] = Field(default_factory=list)
+    discovered: bool = False
+    discovery_timestamp: Optional[str] = None
+    related_elements: List[str] = Field(default_factory=list)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class NPC(LoreElement):
+    lore_type: LoreType = LoreType.NPC
+    role: str = ""
+    disposition: str = "neutral"
+
+
+class Location(LoreElement):
+    lore_type: LoreType = LoreType.LOCATION
+    region: str = ""
+
+
+class Faction(LoreElement):
+    lore_type: LoreType = LoreType.FACTION
+    alignment: str = "neutral"
+    influence: int = 0
+
+
+class Item(LoreElement):
+    lore_type: LoreType = LoreType.ITEM
+    rarity: str = "common"
+
+
+class Event(LoreElement):
+    lore_type: LoreType = LoreType.EVENT
+    when: str = ""
+
+
+class JournalEntry(LoreElement):
+    lore_type: LoreType = LoreType.JOURNAL_ENTRY
+    session_id: str = ""
+    entry_text: str = ""
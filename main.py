@@ -0,0 +1,18 @@
+"""Entry point: run the Hollow Host web table."""
+
+import logging
+
+import uvicorn
+
+from ui.web import create_app
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=8000)
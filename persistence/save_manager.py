@@ -0,0 +1,700 @@
+"""Versioned world-state persistence.
+
+Every save appends a new immutable version row to SQLite and mirrors the
+state to a JSON backup file so campaigns survive a corrupted database.
+"""
+
+import atexit
+import logging
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import jsonpatch
+import orjson
+import zstandard
+
+from game.models import WorldState
+
+log = logging.getLogger(__name__)
+
+# First bytes of every zstd frame; rows written before compression landed
+# are plain JSON text and are passed through unchanged.
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Hot statements as module constants: sqlite3 caches compiled statements per
+# connection keyed on the SQL text, so keeping one canonical string per
+# statement guarantees a cache hit instead of a re-parse on every save in an
+# autosave burst.
+_SQL_LAST_VERSION = (
+    "SELECT version, base_version FROM world_states"
+    " WHERE campaign_id = ? ORDER BY version DESC LIMIT 1"
+)
+_SQL_MAX_VERSION = "SELECT MAX(version) FROM world_states WHERE campaign_id = ?"
+_SQL_VERSION_EXISTS = (
+    "SELECT 1 FROM world_states WHERE campaign_id = ? AND version = ?"
+)
+_SQL_SELECT_ROW = (
+    "SELECT base_version, state_data FROM world_states"
+    " WHERE campaign_id = ? AND version = ?"
+)
+_SQL_SELECT_CHAIN = (
+    "SELECT base_version, state_data FROM world_states"
+    " WHERE campaign_id = ? AND version BETWEEN ? AND ?"
+    " ORDER BY version"
+)
+_SQL_INSERT_WS = (
+    "INSERT INTO world_states"
+    " (campaign_id, version, timestamp, name, base_version, state_data)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_AE = (
+    "INSERT INTO autosave_events (campaign_id, version, timestamp, event_type)"
+    " VALUES (?, ?, ?, ?)"
+)
+
+# Import only needs three top-level fields per archived state; plucking them
+# with regexes keeps import I/O-bound instead of parsing (and discarding)
+# every character and location on every row. "version" and "timestamp" only
+# exist at the top level. "name" also appears on characters and locations,
+# but those always serialize after the top-level version field, so a name
+# match is trusted only when it precedes the version match.
+_VERSION_RE = re.compile(rb'"version"\s*:\s*(\d+)')
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
+_NAME_RE = re.compile(rb'"name"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+class SaveManager:
+    """Saves, loads, diffs and archives campaign world states."""
+
+    # Applied once on the shared connection: WAL keeps readers unblocked
+    # during saves and NORMAL drops the full fsync per commit (safe under
+    # WAL); the rest keep temp structures and hot pages in memory with
+    # mmap-backed reads. mmap only costs address space, so 64-bit hosts map
+    # a full gigabyte of the database; 32-bit hosts stay at 256 MiB to
+    # leave room in the 4 GiB address space.
+    _MMAP_SIZE = 1073741824 if sys.maxsize > 2**32 else 268435456
+
+    _PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        f"PRAGMA mmap_size={_MMAP_SIZE}",
+    )
+
+    # A full snapshot is stored every this many versions; rows in between
+    # hold only the RFC 6902 patch against their predecessor.
+    _BASE_INTERVAL = 10
+
+    # Autosaves arriving within this many seconds of each other collapse
+    # into a single committed version, amortizing the fsync per burst.
+    _AUTOSAVE_WINDOW = 0.5
+
+    def __init__(self, saves_dir: str = "data/saves"):
+        self.saves_dir = saves_dir
+        os.makedirs(self.saves_dir, exist_ok=True)
+        self.db_path = os.path.join(self.saves_dir, "saves.db")
+        # One connection for the manager's lifetime: opening per call repays
+        # schema parse, PRAGMA setup and WAL recovery checks on every save.
+        # isolation_level=None disables the driver's implicit transactions;
+        # writes open their own BEGIN below. The lock serializes cursor use
+        # across threads (check_same_thread=False alone is not enough).
+        # Reused codec objects: constructing a ZstdCompressor per save costs
+        # more than the compression itself for small states.
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+        # Write-through cache of each campaign's newest state: resuming from
+        # autosave is the common load and it usually follows a save made by
+        # this same process, so it should not repay parse + validation.
+        self._latest_cache: Dict[str, WorldState] = {}
+        # Debounce state for autosave bursts: the newest pending copy plus
+        # every event type seen in the current window, per campaign.
+        self._pending_autosaves: Dict[str, tuple] = {}
+        self._autosave_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        for pragma in self._PRAGMAS:
+            self._conn.execute(pragma)
+        self._init_db()
+        # The JSON mirror is a convenience copy: its fsync does not need to
+        # serialize with the SQLite commit, so a single worker drains the
+        # writes off the caller's thread in save order.
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Flush pending saves and writes, then close the shared connection."""
+        try:
+            self.flush_autosaves()
+        except sqlite3.ProgrammingError:
+            pass
+        self._io_pool.shutdown(wait=True)
+        try:
+            self._conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+    def flush_backups(self) -> None:
+        """Block until every queued JSON backup write has hit the disk."""
+        self._io_pool.submit(lambda: None).result()
+
+    def _init_db(self) -> None:
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS world_states (
+                    campaign_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    name TEXT,
+                    base_version INTEGER,
+                    state_data BLOB NOT NULL,
+                    PRIMARY KEY (campaign_id, version)
+                )
+                """
+            )
+            # Databases created before state_data was compressed lack the
+            # denormalized name column (json_extract cannot look inside a
+            # zstd blob, so the name is stored alongside it at save time).
+            columns = {
+                row[1]
+                for row in cursor.execute("PRAGMA table_info(world_states)")
+            }
+            if "name" not in columns:
+                cursor.execute("ALTER TABLE world_states ADD COLUMN name TEXT")
+            # NULL base_version marks a full snapshot; otherwise state_data is
+            # a patch against the previous version and base_version points at
+            # the nearest full snapshot. Pre-delta rows are all snapshots.
+            if "base_version" not in columns:
+                cursor.execute(
+                    "ALTER TABLE world_states ADD COLUMN base_version INTEGER"
+                )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS autosave_events (
+                    campaign_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    event_type TEXT NOT NULL
+                )
+                """
+            )
+            # Backs the list_versions LEFT JOIN with an index-only probe;
+            # without it every version row scans all of autosave_events.
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ae_cid_ver"
+                " ON autosave_events(campaign_id, version)"
+            )
+            cursor.execute("COMMIT")
+
+    def save_world_state(
+        self,
+        state: WorldState,
+        auto_save: bool = False,
+        event_type: Optional[str] = None,
+    ) -> int:
+        """Persist ``state`` as a new version, returning the version number.
+
+        Autosaves are debounced: rapid bursts (combat rounds) coalesce into
+        one committed version per window, though every event type is still
+        recorded against it. Manual saves flush any pending autosave first
+        so version order always matches call order.
+        """
+        if auto_save:
+            with self._lock:
+                copy = state.model_copy(deep=True)
+                pending = self._pending_autosaves.get(state.campaign_id)
+                events = pending[1] if pending else []
+                events.append(event_type or "autosave")
+                self._pending_autosaves[state.campaign_id] = (copy, events)
+                # The version the eventual flush will allocate; stable
+                # because manual saves drain the window before committing.
+                cursor = self._conn.cursor()
+                cursor.execute(_SQL_LAST_VERSION, (state.campaign_id,))
+                last = cursor.fetchone()
+                version = (last[0] + 1) if last else 1
+                state.version = copy.version = version
+                self._latest_cache[state.campaign_id] = copy
+                if self._autosave_timer is not None:
+                    self._autosave_timer.cancel()
+                self._autosave_timer = threading.Timer(
+                    self._AUTOSAVE_WINDOW, self.flush_autosaves
+                )
+                self._autosave_timer.daemon = True
+                self._autosave_timer.start()
+            return version
+        self.flush_autosaves()
+        return self._commit_state(state, [])
+
+    def flush_autosaves(self) -> None:
+        """Commit any autosaves still waiting out their debounce window."""
+        with self._lock:
+            if self._autosave_timer is not None:
+                self._autosave_timer.cancel()
+                self._autosave_timer = None
+            pending = self._pending_autosaves
+            self._pending_autosaves = {}
+        for copy, events in pending.values():
+            self._commit_state(copy, events)
+
+    def _commit_state(self, state: WorldState, event_types: List[str]) -> int:
+        with self._lock:
+            cursor = self._conn.cursor()
+            # BEGIN before the MAX read so the version we allocate cannot be
+            # taken by a concurrent save.
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(_SQL_LAST_VERSION, (state.campaign_id,))
+                last = cursor.fetchone()
+                version = (last[0] + 1) if last else 1
+                state.version = version
+                state.timestamp = datetime.now().isoformat()
+                # exclude_defaults trims untouched default fields from the
+                # payload; defaults are filled back in on validation.
+                # exclude_unset is deliberately not used: in-place container
+                # mutations (set_flag etc.) never mark a field as set, so it
+                # would silently drop them.
+                state_json = state.model_dump_json(exclude_defaults=True)
+                # Delta storage: most turns touch a handful of flags, so a
+                # patch row is orders of magnitude smaller than a snapshot.
+                # A full snapshot every _BASE_INTERVAL versions bounds the
+                # patch chain a load has to replay.
+                base_version = None
+                data = None
+                if last is not None:
+                    last_base = last[1] if last[1] is not None else last[0]
+                    if version - last_base < self._BASE_INTERVAL:
+                        prev = self._materialize(cursor, state.campaign_id,
+                                                 last[0])
+                        if prev is not None:
+                            patch = jsonpatch.make_patch(
+                                prev, orjson.loads(state_json)
+                            ).patch
+                            base_version = last_base
+                            data = self._compress_state(orjson.dumps(patch))
+                if data is None:
+                    base_version = None
+                    data = self._compress_state(state_json)
+                cursor.execute(
+                    _SQL_INSERT_WS,
+                    (state.campaign_id, version, state.timestamp, state.name,
+                     base_version, data),
+                )
+                if event_types:
+                    cursor.executemany(
+                        _SQL_INSERT_AE,
+                        [(state.campaign_id, version, state.timestamp, event)
+                         for event in event_types],
+                    )
+                cursor.execute("COMMIT")
+                # Deep copy so later caller mutations cannot leak into what
+                # the cache hands back.
+                self._latest_cache[state.campaign_id] = state.model_copy(
+                    deep=True
+                )
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        # Mirror to a JSON backup file off-thread: the caller is usually the
+        # game loop and should not wait on a second fsync for a copy that
+        # only matters if the database corrupts.
+        self._io_pool.submit(
+            self._write_json_backup,
+            self._state_file(state.campaign_id, version),
+            state_json,
+        )
+        return version
+
+    def _write_json_backup(self, backup_path: str, state_json: str) -> None:
+        # Write-then-rename: readers either see the complete file or none at
+        # all (loads fall back to the database row), never a torn write.
+        directory = os.path.dirname(backup_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(state_json)
+            os.replace(tmp_path, backup_path)
+        except OSError:
+            # The backup is the corruption-recovery copy; a save that quietly
+            # loses it would hurt exactly when it matters, so leave a trace.
+            log.exception("Failed to write world-state backup %s", backup_path)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _state_file(self, campaign_id: str, version: int) -> str:
+        return os.path.join(
+            self.saves_dir, campaign_id, f"{campaign_id}_v{version}.json"
+        )
+
+    def _compress_state(self, state_json: Union[str, bytes]) -> bytes:
+        if isinstance(state_json, str):
+            state_json = state_json.encode("utf-8")
+        return self._compressor.compress(state_json)
+
+    def _decompress_state(self, state_data: Union[str, bytes]) -> str:
+        """Return the JSON text for a state_data value of any vintage."""
+        if isinstance(state_data, bytes):
+            if state_data[:4] == _ZSTD_MAGIC:
+                return self._decompressor.decompress(state_data).decode("utf-8")
+            return state_data.decode("utf-8")
+        return state_data
+
+    def _materialize(
+        self, cursor: sqlite3.Cursor, campaign_id: str, version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Rebuild the full state dict for a version from its DB rows.
+
+        Snapshot rows decode directly; patch rows are replayed from the
+        nearest base snapshot, fetched in a single range query. Must be
+        called with the lock held.
+        """
+        cursor.execute(_SQL_SELECT_ROW, (campaign_id, version))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        base_version, state_data = row
+        if base_version is None:
+            return orjson.loads(self._decompress_state(state_data))
+        cursor.execute(_SQL_SELECT_CHAIN, (campaign_id, base_version, version))
+        state: Optional[Dict[str, Any]] = None
+        for row_base, row_data in cursor.fetchall():
+            text = self._decompress_state(row_data)
+            if row_base is None:
+                state = orjson.loads(text)
+            else:
+                state = jsonpatch.apply_patch(state, orjson.loads(text))
+        return state
+
+    def load_world_state(
+        self, campaign_id: str, version: Optional[int] = None
+    ) -> Optional[WorldState]:
+        """Load one version of a campaign (the latest when unspecified)."""
+        with self._lock:
+            if version is None:
+                cached = self._latest_cache.get(campaign_id)
+                if cached is not None:
+                    return cached.model_copy(deep=True)
+            cursor = self._conn.cursor()
+            # SQLite only resolves/verifies the version; the state itself is
+            # read from the mirrored backup file below when possible.
+            if version is None:
+                cursor.execute(_SQL_MAX_VERSION, (campaign_id,))
+                row = cursor.fetchone()
+                if row is None or row[0] is None:
+                    return None
+                version = row[0]
+            else:
+                cursor.execute(_SQL_VERSION_EXISTS, (campaign_id, version))
+                if cursor.fetchone() is None:
+                    return None
+        # Prefer the backup file: mmap lets the OS page cache serve repeat
+        # loads and skips the SQLite row copy. pydantic-core only takes
+        # str/bytes, so the map is snapshotted once into bytes - still one
+        # copy fewer than fetching the TEXT column and re-encoding.
+        try:
+            fd = os.open(self._state_file(campaign_id, version), os.O_RDONLY)
+        except OSError:
+            fd = -1
+        if fd >= 0:
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    return WorldState.model_validate_json(bytes(mm))
+            finally:
+                os.close(fd)
+        # Backup file missing (e.g. imported campaign): fall back to the
+        # rows, replaying patches from the nearest snapshot when needed.
+        with self._lock:
+            state = self._materialize(self._conn.cursor(), campaign_id, version)
+        if state is None:
+            return None
+        return WorldState.model_validate(state)
+
+    def list_campaigns(self) -> List[Dict[str, Any]]:
+        """Return the latest version summary for every campaign."""
+        with self._lock:
+            cursor = self._conn.cursor()
+            # Single pass via ROW_NUMBER instead of a GROUP BY subquery plus
+            # self-join; the (campaign_id, version) primary key feeds the
+            # window partitions already sorted.
+            cursor.execute(
+                """
+                SELECT campaign_id, version, timestamp, name FROM (
+                    SELECT campaign_id, version, timestamp,
+                           COALESCE(name, CASE
+                               WHEN json_valid(state_data)
+                               THEN json_extract(state_data, '$.name')
+                           END) AS name,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY campaign_id ORDER BY version DESC
+                           ) AS rn
+                    FROM world_states
+                ) WHERE rn = 1
+                ORDER BY campaign_id
+                """
+            )
+            rows = cursor.fetchall()
+        return [
+            {"campaign_id": r[0], "version": r[1], "timestamp": r[2], "name": r[3]}
+            for r in rows
+        ]
+
+    def list_versions(self, campaign_id: str) -> List[Dict[str, Any]]:
+        """Return every saved version of a campaign, newest first."""
+        # Commit anything still inside the debounce window so the newest
+        # autosave shows up in the listing.
+        self.flush_autosaves()
+        with self._lock:
+            cursor = self._conn.cursor()
+            # GROUP_CONCAT keeps one row per version even when a debounced
+            # autosave recorded several event types against it.
+            cursor.execute(
+                """
+                SELECT ws.version, ws.timestamp, GROUP_CONCAT(ae.event_type)
+                FROM world_states ws
+                LEFT JOIN autosave_events ae
+                  ON ae.campaign_id = ws.campaign_id
+                 AND ae.version = ws.version
+                WHERE ws.campaign_id = ?
+                GROUP BY ws.version, ws.timestamp
+                ORDER BY ws.version DESC
+                """,
+                (campaign_id,),
+            )
+            rows = cursor.fetchall()
+        return [
+            {"version": r[0], "timestamp": r[1], "event_type": r[2]} for r in rows
+        ]
+
+    def export_campaign(self, campaign_id: str, output_path: str) -> str:
+        """Archive every version of a campaign into a zip, returning its path."""
+        zip_path = (
+            output_path if output_path.endswith(".zip") else output_path + ".zip"
+        )
+        # An autosave still inside the debounce window exists only in the
+        # cache; commit it so the archive holds the newest state.
+        self.flush_autosaves()
+        # Rows stream straight into the archive entry: no temp directory to
+        # populate, walk and delete, and no re-read of bytes just written.
+        with zipfile.ZipFile(
+            zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+        ) as zf:
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute(
+                    "SELECT base_version, state_data FROM world_states"
+                    " WHERE campaign_id = ? ORDER BY version",
+                    (campaign_id,),
+                )
+                cursor.arraysize = 500
+                # Archives stay portable full-JSON regardless of how rows
+                # are stored: walking in version order keeps one running
+                # state so each patch row is applied exactly once.
+                current: Optional[Dict[str, Any]] = None
+                with zf.open("versions.ndjson", mode="w") as entry:
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        for base_version, state_data in rows:
+                            text = self._decompress_state(state_data)
+                            if base_version is None:
+                                current = orjson.loads(text)
+                                data = text.encode("utf-8")
+                            else:
+                                current = jsonpatch.apply_patch(
+                                    current, orjson.loads(text)
+                                )
+                                data = orjson.dumps(current)
+                            entry.write(data)
+                            entry.write(b"\n")
+                cursor.execute(
+                    "SELECT version, timestamp, event_type FROM autosave_events"
+                    " WHERE campaign_id = ? ORDER BY version",
+                    (campaign_id,),
+                )
+                events = [
+                    {"version": r[0], "timestamp": r[1], "event_type": r[2]}
+                    for r in cursor.fetchall()
+                ]
+            zf.writestr(
+                "autosave_events.json",
+                orjson.dumps(events, option=orjson.OPT_INDENT_2),
+            )
+        return zip_path
+
+    def import_campaign(self, archive_path: str, campaign_id: str) -> int:
+        """Restore a campaign from an exported archive, replacing existing rows.
+
+        Returns the number of versions imported.
+        """
+        with zipfile.ZipFile(archive_path) as zf:
+            names = set(zf.namelist())
+            state_rows = []
+            if "versions.ndjson" in names:
+                # Entries decompress straight out of the archive; nothing is
+                # unpacked to disk first.
+                with zf.open("versions.ndjson") as f:
+                    for line in f:
+                        state_data = line.rstrip(b"\n")
+                        if not state_data:
+                            continue
+                        state_rows.append(
+                            self._import_row(campaign_id, state_data)
+                        )
+            else:
+                # Archives from before the consolidated NDJSON layout.
+                for filename in sorted(names):
+                    if not filename.startswith("version_"):
+                        continue
+                    state_rows.append(
+                        self._import_row(campaign_id, zf.read(filename))
+                    )
+            event_rows = []
+            if "autosave_events.json" in names:
+                events = orjson.loads(zf.read("autosave_events.json"))
+                event_rows = [
+                    (campaign_id, e["version"], e["timestamp"], e["event_type"])
+                    for e in events
+                ]
+        with self._lock:
+            cursor = self._conn.cursor()
+            # One write transaction for the whole restore: a single fsync
+            # instead of one per row, and no reader ever sees a
+            # half-imported campaign.
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(
+                    "DELETE FROM world_states WHERE campaign_id = ?",
+                    (campaign_id,),
+                )
+                cursor.execute(
+                    "DELETE FROM autosave_events WHERE campaign_id = ?",
+                    (campaign_id,),
+                )
+                cursor.executemany(_SQL_INSERT_WS, state_rows)
+                cursor.executemany(_SQL_INSERT_AE, event_rows)
+                cursor.execute("COMMIT")
+                # The imported rows replace whatever this process last saved.
+                self._latest_cache.pop(campaign_id, None)
+                self._pending_autosaves.pop(campaign_id, None)
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        # Drop the campaign's mirror files too: loads prefer them over the
+        # database, so a leftover mirror for an overlapping version number
+        # would silently shadow the imported rows. Drain the backup worker
+        # first so an in-flight write cannot recreate one afterwards.
+        self.flush_backups()
+        shutil.rmtree(os.path.join(self.saves_dir, campaign_id),
+                      ignore_errors=True)
+        return len(state_rows)
+
+    def _import_row(self, campaign_id: str, state_data: bytes) -> tuple:
+        """Build a world_states insert tuple from one archived state."""
+        version = _VERSION_RE.search(state_data)
+        timestamp = _TIMESTAMP_RE.search(state_data)
+        # Archived states dumped with exclude_defaults omit a default name,
+        # so fall back to the model default rather than storing NULL - a
+        # NULL would send list_campaigns into its json_extract fallback,
+        # which cannot read the compressed blob being inserted here.
+        default_name = WorldState.model_fields["name"].default
+        if version is None or timestamp is None:
+            # Unexpected shape - pay the full parse to stay correct.
+            state = orjson.loads(state_data)
+            return (campaign_id, state["version"], state["timestamp"],
+                    state.get("name", default_name), None,
+                    self._compress_state(state_data))
+        name_match = _NAME_RE.search(state_data)
+        name = default_name
+        if name_match is not None and name_match.start() < version.start():
+            # The matched group is a JSON string literal; orjson unescapes it.
+            name = orjson.loads(name_match.group(1))
+        return (campaign_id, int(version.group(1)),
+                timestamp.group(1).decode("utf-8"), name, None,
+                self._compress_state(state_data))
+
+    def _load_state_dict(
+        self, campaign_id: str, version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch one version as a plain dict, skipping pydantic validation."""
+        try:
+            with open(self._state_file(campaign_id, version), "rb") as f:
+                return orjson.loads(f.read())
+        except OSError:
+            pass
+        with self._lock:
+            return self._materialize(self._conn.cursor(), campaign_id, version)
+
+    def get_diff(
+        self, campaign_id: str, version1: int, version2: int
+    ) -> Optional[Dict[str, Any]]:
+        """Describe what changed between two versions of a campaign."""
+        # Either endpoint may be a version predicted for a still-debounced
+        # autosave; commit those first so both resolve against real rows.
+        self.flush_autosaves()
+        # Diffing only compares keys and raw values, so both sides stay
+        # plain dicts - validating two full WorldState models just to throw
+        # them away dominated the cost for large worlds.
+        state1 = self._load_state_dict(campaign_id, version1)
+        state2 = self._load_state_dict(campaign_id, version2)
+        if state1 is None or state2 is None:
+            return None
+        # .get with {}: dumps exclude untouched defaults, so an empty
+        # section may be absent from the stored JSON entirely.
+        return {
+            "characters": self._diff_section(
+                state1.get("characters", {}), state2.get("characters", {})
+            ),
+            "locations": self._diff_section(
+                state1.get("locations", {}), state2.get("locations", {})
+            ),
+            "world_flags": self._diff_section(
+                state1.get("world_flags", {}), state2.get("world_flags", {})
+            ),
+        }
+
+    def _diff_section(
+        self, side1: Dict[str, Any], side2: Dict[str, Any]
+    ) -> Dict[str, List[str]]:
+        # Two-pointer merge over sorted keys: one pass, no throwaway hash
+        # sets, and the result lists come out sorted for free.
+        keys1 = sorted(side1)
+        keys2 = sorted(side2)
+        added: List[str] = []
+        removed: List[str] = []
+        modified: List[str] = []
+        i = j = 0
+        n1, n2 = len(keys1), len(keys2)
+        while i < n1 and j < n2:
+            key1, key2 = keys1[i], keys2[j]
+            if key1 == key2:
+                if side1[key1] != side2[key2]:
+                    modified.append(key1)
+                i += 1
+                j += 1
+            elif key1 < key2:
+                removed.append(key1)
+                i += 1
+            else:
+                added.append(key2)
+                j += 1
+        removed.extend(keys1[i:])
+        added.extend(keys2[j:])
+        return {"added": added, "removed": removed, "modified": modified}
@@ -0,0 +1,188 @@
+"""Ruleset models and the YAML ruleset loader.
+
+Rulesets are YAML files under the rules directory. A ruleset either has
+``type: template`` (shipped starting points, re-seeded when missing) or
+``type: custom`` (built in the UI from a template plus modifications).
+"""
+
+import copy
+import os
+from typing import Any, Dict, List, Optional
+
+import yaml
+from pydantic import BaseModel, Field
+
+DEFAULT_RULES_DIR = os.path.join("data", "rules")
+
+
+class StatusEffect(BaseModel):
+    """A condition that can be applied to a combatant."""
+
+    name: str
+    duration: int = 1
+    effect: str = ""
+
+
+class CombatRules(BaseModel):
+    """Knobs governing how combat rounds are resolved."""
+
+    initiative_stat: str = "DEX"
+    base_defense: int = 10
+    critical_threshold: int = 20
+    flee_difficulty: int = 12
+
+
+class Ruleset(BaseModel):
+    """A full set of table rules."""
+
+    name: str
+    description: str = ""
+    version: str = "1.0"
+    type: str = "custom"
+    checks: Dict[str, str] = Field(default_factory=dict)
+    difficulty_classes: Dict[str, int] = Field(default_factory=dict)
+    combat: CombatRules = Field(default_factory=CombatRules)
+    status_effects: List[StatusEffect] = Field(default_factory=list)
+
+
+_BUILTIN_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "classic.yaml": {
+        "name": "Classic",
+        "description": "Straightforward d20-style checks and combat.",
+        "version": "1.0",
+        "type": "template",
+        "checks": {
+            "athletics": "STR",
+            "stealth": "DEX",
+            "arcana": "INT",
+            "persuasion": "CHA",
+        },
+        "difficulty_classes": {"easy": 8, "medium": 12, "hard": 16},
+        "combat": {
+            "initiative_stat": "DEX",
+            "base_defense": 10,
+            "critical_threshold": 20,
+            "flee_difficulty": 12,
+        },
+        "status_effects": [
+            {"name": "poisoned", "duration": 3, "effect": "-2 to all checks"},
+            {"name": "stunned", "duration": 1, "effect": "skip next action"},
+        ],
+    },
+    "gritty.yaml": {
+        "name": "Gritty",
+        "description": "Low-magic, high-lethality variant.",
+        "version": "1.0",
+        "type": "template",
+        "checks": {
+            "athletics": "STR",
+            "stealth": "DEX",
+            "survival": "WIS",
+        },
+        "difficulty_classes": {"easy": 10, "medium": 14, "hard": 18},
+        "combat": {
+            "initiative_stat": "WIS",
+            "base_defense": 8,
+            "critical_threshold": 19,
+            "flee_difficulty": 14,
+        },
+        "status_effects": [
+            {"name": "bleeding", "duration": 2, "effect": "1 damage per round"},
+        ],
+    },
+}
+
+
+class RulesetLoader:
+    """Loads, lists and builds rulesets from the rules directory."""
+
+    def __init__(self, rules_dir: str = DEFAULT_RULES_DIR):
+        self.rules_dir = rules_dir
+        os.makedirs(self.rules_dir, exist_ok=True)
+        self._seed_templates()
+
+    def _seed_templates(self) -> None:
+        """Write the built-in template rulesets when they are missing."""
+        for filename, data in _BUILTIN_TEMPLATES.items():
+            path = os.path.join(self.rules_dir, filename)
+            if not os.path.exists(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    yaml.safe_dump(data, f, sort_keys=False)
+
+    def list_rulesets(self) -> List[Dict[str, Any]]:
+        """Return summary dicts for every ruleset file in the rules directory."""
+        rulesets = []
+        for filename in sorted(os.listdir(self.rules_dir)):
+            if not filename.endswith((".yaml", ".yml")):
+                continue
+            path = os.path.join(self.rules_dir, filename)
+            with open(path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            rulesets.append(
+                {
+                    "filename": filename,
+                    "name": data.get("name", filename),
+                    "description": data.get("description", ""),
+                    "version": data.get("version", ""),
+                    "type": data.get("type", "custom"),
+                }
+            )
+        return rulesets
+
+    def load_ruleset(self, filename: str) -> Ruleset:
+        """Load and validate a single ruleset file."""
+        path = os.path.join(self.rules_dir, filename)
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        return Ruleset.model_validate(data)
+
+    def create_ruleset_from_template(
+        self, template_filename: str, modifications: Dict[str, Any]
+    ) -> str:
+        """Deep-merge ``modifications`` over a template and save the result.
+
+        Returns the filename of the newly written custom ruleset.
+        """
+        path = os.path.join(self.rules_dir, template_filename)
+        with open(path, "r", encoding="utf-8") as f:
+            base = yaml.safe_load(f) or {}
+        merged = self._deep_merge(copy.deepcopy(base), modifications)
+        merged["type"] = "custom"
+        ruleset = Ruleset.model_validate(merged)
+        out_name = f"{ruleset.name.replace(' ', '_').lower()}.yaml"
+        out_path = os.path.join(self.rules_dir, out_name)
+        with open(out_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(ruleset.model_dump(), f, sort_keys=False)
+        return out_name
+
+    def validate_upload(self, filename: str, content: bytes) -> Optional[str]:
+        """Validate uploaded ruleset content, returning its target path.
+
+        Returns None when the content is not a usable ruleset. No file is
+        written; callers choose how (and how asynchronously) to persist.
+        """
+        data = yaml.safe_load(content)
+        if not isinstance(data, dict) or "name" not in data:
+            return None
+        Ruleset.model_validate(data)
+        return os.path.join(self.rules_dir, os.path.basename(filename))
+
+    def save_uploaded(self, filename: str, content: bytes) -> Optional[str]:
+        """Validate and store an uploaded ruleset, returning its filename."""
+        path = self.validate_upload(filename, content)
+        if path is None:
+            return None
+        with open(path, "wb") as f:
+            f.write(content)
+        return os.path.basename(path)
+
+    @staticmethod
+    def _deep_merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in overlay.items():
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                RulesetLoader._deep_merge(base[key], value)
+            elif isinstance(value, list) and isinstance(base.get(key), list) and value:
+                base[key] = base[key] + value
+            else:
+                base[key] = value
+        return base
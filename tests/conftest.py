@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolate_data_dir(tmp_path, monkeypatch):
+    """Run every test from a scratch directory so data/ never leaks."""
+    monkeypatch.chdir(tmp_path)
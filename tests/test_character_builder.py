@@ -0,0 +1,37 @@
+from characters.builder import CharacterBuilder
+
+
+def test_create_and_get_character_roundtrip():
+    builder = CharacterBuilder()
+    created = builder.create_character(
+        name="Mira Vexley",
+        ancestry="elf",
+        char_class="warden",
+        stats={"STR": 12, "CON": 14},
+        skills={"stealth": 2},
+    )
+    loaded = builder.get_character("Mira Vexley")
+    assert loaded is not None
+    assert loaded == created
+    assert loaded.hp == 10  # 8 + (14 - 10) // 2
+
+
+def test_list_characters_summaries():
+    builder = CharacterBuilder()
+    builder.create_character(name="Ash")
+    builder.create_character(name="Bryn", ancestry="dwarf")
+    names = [c["name"] for c in builder.list_characters()]
+    assert names == ["Ash", "Bryn"]
+
+
+def test_get_first_character():
+    builder = CharacterBuilder()
+    assert builder.get_first_character() is None
+    builder.create_character(name="Bryn")
+    builder.create_character(name="Ash")
+    assert builder.get_first_character().name == "Ash"
+
+
+def test_get_missing_character_returns_none():
+    builder = CharacterBuilder()
+    assert builder.get_character("nobody") is None
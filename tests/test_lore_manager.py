@@ -0,0 +1,122 @@
+import pytest
+
+from lore.manager import LoreManager
+from lore.models import Faction, JournalEntry, LoreType, NPC
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return LoreManager(db_path=str(tmp_path / "lore.db"))
+
+
+def _npc(element_id="npc-1", name="Silas", **kwargs):
+    defaults = dict(
+        id=element_id,
+        campaign_id="camp-1",
+        name=name,
+        description="A lamplighter with a long memory.",
+        tags=["town", "ally"],
+        role="lamplighter",
+    )
+    defaults.update(kwargs)
+    return NPC(**defaults)
+
+
+def test_add_and_get_roundtrip(manager):
+    npc = _npc()
+    manager.add_lore_element(npc)
+    loaded = manager.get_lore_element("npc-1", "camp-1")
+    assert isinstance(loaded, NPC)
+    assert loaded == npc
+
+
+def test_add_lore_elements_bulk(manager):
+    manager.add_lore_elements([_npc("npc-1", "Silas"), _npc("npc-2", "Vesna")])
+    assert {n.name for n in manager.get_lore_by_type("camp-1", LoreType.NPC)} == {
+        "Silas",
+        "Vesna",
+    }
+
+
+def test_add_twice_updates_in_place(manager):
+    manager.add_lore_element(_npc())
+    manager.add_lore_element(_npc(description="Changed."))
+    loaded = manager.get_lore_element("npc-1", "camp-1")
+    assert loaded.description == "Changed."
+    assert len(manager.get_lore_by_type("camp-1", LoreType.NPC)) == 1
+
+
+def test_get_lore_by_type_and_discovered_filter(manager):
+    manager.add_lore_element(_npc("npc-1", "Silas"))
+    manager.add_lore_element(_npc("npc-2", "Vesna", discovered=True))
+    manager.add_lore_element(
+        Faction(id="fac-1", campaign_id="camp-1", name="The Quiet Court")
+    )
+    npcs = manager.get_lore_by_type("camp-1", LoreType.NPC)
+    assert {n.name for n in npcs} == {"Silas", "Vesna"}
+    discovered = manager.get_lore_by_type("camp-1", LoreType.NPC, discovered_only=True)
+    assert [n.name for n in discovered] == ["Vesna"]
+
+
+def test_iter_lore_by_type_streams(manager):
+    manager.add_lore_elements([_npc("npc-1", "Silas"), _npc("npc-2", "Vesna")])
+    iterator = manager.iter_lore_by_type("camp-1", LoreType.NPC)
+    first = next(iterator)
+    assert isinstance(first, NPC)
+    assert {first.name} | {n.name for n in iterator} == {"Silas", "Vesna"}
+
+
+def test_search_lore_by_tags(manager):
+    manager.add_lore_element(_npc("npc-1", "Silas", tags=["town", "ally"]))
+    manager.add_lore_element(_npc("npc-2", "Vesna", tags=["town", "rival"]))
+    town = manager.search_lore_by_tags("camp-1", ["town"])
+    assert {n.name for n in town} == {"Silas", "Vesna"}
+    both = manager.search_lore_by_tags("camp-1", ["town", "ally"], match_all=True)
+    assert [n.name for n in both] == ["Silas"]
+    either = manager.search_lore_by_tags("camp-1", ["ally", "rival"])
+    assert {n.name for n in either} == {"Silas", "Vesna"}
+
+
+def test_search_lore_by_text(manager):
+    manager.add_lore_element(_npc("npc-1", "Silas"))
+    manager.add_lore_element(_npc("npc-2", "Vesna", description="Keeps ravens."))
+    hits = manager.search_lore_by_text("camp-1", "ravens")
+    assert [h.name for h in hits] == ["Vesna"]
+
+
+def test_related_lore(manager):
+    manager.add_lore_element(_npc("npc-1", "Silas", related_elements=["fac-1"]))
+    manager.add_lore_element(
+        Faction(id="fac-1", campaign_id="camp-1", name="The Quiet Court")
+    )
+    related = manager.get_related_lore("npc-1", "camp-1")
+    assert [r.name for r in related] == ["The Quiet Court"]
+    assert isinstance(related[0], Faction)
+
+
+def test_journal_entries_filtered_by_session(manager):
+    for i, session in enumerate(["s1", "s1", "s2"], start=1):
+        manager.add_lore_element(
+            JournalEntry(
+                id=f"j-{i}",
+                campaign_id="camp-1",
+                name=f"Entry {i}",
+                session_id=session,
+                entry_text="The night was long.",
+                discovery_timestamp=f"2026-01-0{i}T12:00:00",
+            )
+        )
+    all_entries = manager.get_journal_entries("camp-1")
+    assert [e.id for e in all_entries] == ["j-3", "j-2", "j-1"]
+    s1 = manager.get_journal_entries("camp-1", session_id="s1")
+    assert {e.id for e in s1} == {"j-1", "j-2"}
+
+
+def test_mark_as_discovered(manager):
+    manager.add_lore_element(_npc())
+    element = manager.mark_as_discovered("npc-1", "camp-1")
+    assert element.discovered is True
+    assert element.discovery_timestamp is not None
+    reloaded = manager.get_lore_element("npc-1", "camp-1")
+    assert reloaded.discovered is True
+    assert reloaded.discovery_timestamp == element.discovery_timestamp
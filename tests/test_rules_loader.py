@@ -0,0 +1,42 @@
+from rules.loader import RulesetLoader
+
+
+def test_templates_are_seeded():
+    loader = RulesetLoader()
+    rulesets = loader.list_rulesets()
+    assert all(r["type"] == "template" for r in rulesets)
+    assert {r["name"] for r in rulesets} == {"Classic", "Gritty"}
+
+
+def test_create_ruleset_from_template_merges_modifications():
+    loader = RulesetLoader()
+    filename = loader.create_ruleset_from_template(
+        "classic.yaml",
+        {
+            "name": "House Rules",
+            "description": "Our table variant.",
+            "difficulty_classes": {"hard": 18},
+            "status_effects": [{"name": "dazed", "duration": 2, "effect": "-1 to hit"}],
+        },
+    )
+    ruleset = loader.load_ruleset(filename)
+    assert ruleset.name == "House Rules"
+    assert ruleset.type == "custom"
+    # Overridden value wins, untouched values survive.
+    assert ruleset.difficulty_classes["hard"] == 18
+    assert ruleset.difficulty_classes["easy"] == 8
+    # Added status effect is appended to the template's list.
+    assert [e.name for e in ruleset.status_effects][-1] == "dazed"
+    assert ruleset.checks["athletics"] == "STR"
+
+
+def test_save_uploaded_rejects_invalid_yaml():
+    loader = RulesetLoader()
+    assert loader.save_uploaded("bad.yaml", b"- not\n- a\n- ruleset\n") is None
+
+
+def test_save_uploaded_accepts_valid_ruleset():
+    loader = RulesetLoader()
+    content = b"name: Uploaded\ndescription: from a file\ntype: custom\n"
+    assert loader.save_uploaded("uploaded.yaml", content) == "uploaded.yaml"
+    assert loader.load_ruleset("uploaded.yaml").name == "Uploaded"
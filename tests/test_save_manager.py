@@ -0,0 +1,133 @@
+import shutil
+
+import pytest
+
+from game.models import Character, WorldLocation, WorldState
+from persistence.save_manager import SaveManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return SaveManager(saves_dir=str(tmp_path / "saves"))
+
+
+def _state(campaign_id="camp-1", name="The Hollow March"):
+    state = WorldState(campaign_id=campaign_id, name=name)
+    state.add_character(Character(name="Mira", stats={"STR": 12}))
+    state.add_location(
+        WorldLocation(name="Lantern Row", description="A crooked street.")
+    )
+    state.set_flag("gate_open", False)
+    return state
+
+
+def test_save_and_load_roundtrip(manager):
+    state = _state()
+    version = manager.save_world_state(state)
+    assert version == 1
+    loaded = manager.load_world_state("camp-1")
+    assert loaded is not None
+    assert loaded.name == "The Hollow March"
+    assert loaded.characters["Mira"].stats["STR"] == 12
+    assert loaded.locations["Lantern Row"].description == "A crooked street."
+
+
+def test_versions_increment_and_load_specific(manager):
+    state = _state()
+    manager.save_world_state(state)
+    state.set_flag("gate_open", True)
+    assert manager.save_world_state(state) == 2
+    v1 = manager.load_world_state("camp-1", version=1)
+    v2 = manager.load_world_state("camp-1", version=2)
+    assert v1.world_flags["gate_open"] is False
+    assert v2.world_flags["gate_open"] is True
+
+
+def test_load_missing_campaign_returns_none(manager):
+    assert manager.load_world_state("nope") is None
+
+
+def test_list_campaigns_reports_latest(manager):
+    manager.save_world_state(_state("camp-1", "First"))
+    state2 = _state("camp-2", "Second")
+    manager.save_world_state(state2)
+    manager.save_world_state(state2)
+    campaigns = {c["campaign_id"]: c for c in manager.list_campaigns()}
+    assert campaigns["camp-1"]["version"] == 1
+    assert campaigns["camp-2"]["version"] == 2
+    assert campaigns["camp-2"]["name"] == "Second"
+
+
+def test_list_versions_includes_autosave_events(manager):
+    state = _state()
+    manager.save_world_state(state)
+    manager.save_world_state(state, auto_save=True, event_type="combat_end")
+    manager.flush_autosaves()
+    versions = manager.list_versions("camp-1")
+    assert [v["version"] for v in versions] == [2, 1]
+    assert versions[0]["event_type"] == "combat_end"
+    assert versions[1]["event_type"] is None
+
+
+def test_patch_rows_replay_from_snapshot(manager, tmp_path):
+    state = _state()
+    for i in range(12):
+        state.set_flag(f"flag_{i}", i)
+        manager.save_world_state(state)
+    # Force the database path: with the backup files gone, versions stored
+    # as patches must be rebuilt from the nearest full snapshot.
+    manager.flush_backups()
+    shutil.rmtree(tmp_path / "saves" / "camp-1")
+    for version in (1, 7, 12):
+        loaded = manager.load_world_state("camp-1", version=version)
+        assert loaded is not None
+        assert loaded.world_flags[f"flag_{version - 1}"] == version - 1
+    assert manager.load_world_state("camp-1").version == 12
+
+
+def test_autosave_burst_coalesces_into_one_version(manager):
+    state = _state()
+    manager.save_world_state(state)
+    state.set_flag("round", 1)
+    manager.save_world_state(state, auto_save=True, event_type="combat_round")
+    state.set_flag("round", 2)
+    manager.save_world_state(state, auto_save=True, event_type="combat_end")
+    manager.flush_autosaves()
+    versions = manager.list_versions("camp-1")
+    # Both autosaves share one version; both event types are recorded.
+    assert [v["version"] for v in versions] == [2, 1]
+    assert versions[0]["event_type"] == "combat_round,combat_end"
+    assert manager.load_world_state("camp-1").world_flags["round"] == 2
+
+
+def test_export_import_roundtrip(manager, tmp_path):
+    state = _state()
+    manager.save_world_state(state)
+    state.set_flag("gate_open", True)
+    manager.save_world_state(state, auto_save=True, event_type="travel")
+    manager.flush_autosaves()
+    archive = manager.export_campaign("camp-1", str(tmp_path / "camp-1.zip"))
+
+    other = SaveManager(saves_dir=str(tmp_path / "other_saves"))
+    count = other.import_campaign(archive, "camp-1")
+    assert count == 2
+    loaded = other.load_world_state("camp-1")
+    assert loaded.version == 2
+    assert loaded.world_flags["gate_open"] is True
+    versions = other.list_versions("camp-1")
+    assert versions[0]["event_type"] == "travel"
+
+
+def test_get_diff(manager):
+    state = _state()
+    manager.save_world_state(state)
+    state.add_character(Character(name="Bryn"))
+    state.characters["Mira"].hp = 3
+    del state.locations["Lantern Row"]
+    state.set_flag("gate_open", True)
+    manager.save_world_state(state)
+    diff = manager.get_diff("camp-1", 1, 2)
+    assert diff["characters"]["added"] == ["Bryn"]
+    assert diff["characters"]["modified"] == ["Mira"]
+    assert diff["locations"]["removed"] == ["Lantern Row"]
+    assert diff["world_flags"]["modified"] == ["gate_open"]
@@ -0,0 +1,184 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ui.web import create_app
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def test_index_renders(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "Hollow Host" in response.text
+
+
+def test_send_command_returns_narrative_as_text(client):
+    response = client.post("/send", json={"player_input": "look"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "Mist" in response.text
+
+
+def test_send_command_system_response_is_json(client):
+    response = client.post("/send", json={"player_input": "help"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["type"] == "system"
+    assert "roll" in data["response"]
+
+
+def test_websocket_streams_tokens(client):
+    with client.websocket_connect("/ws") as websocket:
+        websocket.send_text("look")
+        start = websocket.receive_json()
+        assert start == {"event": "start", "type": "narrative"}
+        tokens = []
+        while True:
+            frame = websocket.receive_json()
+            if frame["event"] == "end":
+                break
+            tokens.append(frame["text"])
+        assert "Mist" in "".join(tokens)
+
+
+def test_help_lists_commands(client):
+    response = client.get("/help")
+    assert response.status_code == 200
+    assert "roll" in response.text
+
+
+def test_static_css_served(client):
+    response = client.get("/static/css/style.css")
+    assert response.status_code == 200
+    assert "message-log" in response.text
+
+
+def test_static_css_precompressed_variant(client):
+    response = client.get(
+        "/static/css/style.css", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == "gzip"
+    assert "message-log" in response.text
+
+
+def test_character_creation_flow(client):
+    response = client.post(
+        "/character",
+        data={
+            "name": "Mira",
+            "ancestry": "elf",
+            "char_class": "warden",
+            "stats.STR": "12",
+            "stats.DEX": "not-a-number",
+        },
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    page = client.get("/character")
+    assert "Mira" in page.text
+
+    from characters.builder import CharacterBuilder
+
+    character = CharacterBuilder().get_character("Mira")
+    assert character.stats["STR"] == 12
+    assert character.stats["DEX"] == 10  # invalid input falls back to default
+
+
+def test_character_image_upload(client):
+    response = client.post(
+        "/character",
+        data={"name": "Ash"},
+        files={"character_image": ("portrait.PNG", b"\x89PNG fake", "image/png")},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+
+    from characters.builder import CharacterBuilder
+
+    character = CharacterBuilder().get_character("Ash")
+    assert character.portrait == "/static/images/characters/ash.png"
+
+
+def test_ruleset_builder_and_creation(client):
+    page = client.get("/rulesets")
+    assert page.status_code == 200
+    assert "Classic" in page.text
+
+    response = client.post(
+        "/rulesets",
+        data={
+            "name": "House Rules",
+            "template": "classic.yaml",
+            "difficulty_classes.hard": "18",
+            "status_effects[0].name": "dazed",
+            "status_effects[0].duration": "2",
+        },
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+
+    from rules.loader import RulesetLoader
+
+    ruleset = RulesetLoader().load_ruleset("house_rules.yaml")
+    assert ruleset.difficulty_classes["hard"] == 18
+    assert ruleset.status_effects[-1].name == "dazed"
+
+
+def test_view_download_delete_ruleset(client):
+    assert "Classic" in client.get("/rulesets/view/classic.yaml").text
+    assert client.get("/rulesets/download/classic.yaml").status_code == 200
+    assert client.get("/rulesets/download/missing.yaml").status_code == 404
+
+    client.post(
+        "/rulesets",
+        data={"name": "Doomed", "template": "classic.yaml"},
+        follow_redirects=False,
+    )
+    response = client.post("/rulesets/delete/doomed.yaml", follow_redirects=False)
+    assert response.status_code == 303
+    assert client.get("/rulesets/download/doomed.yaml").status_code == 404
+
+
+def test_combat_flow(client):
+    page = client.get("/combat")
+    assert page.status_code == 200
+    assert "Start a fight" in page.text
+
+    # No characters yet: starting combat is refused.
+    refused = client.post("/combat/start", data={"enemies[0].name": "Shade"})
+    assert "Create a character" in refused.text
+
+    client.post("/character", data={"name": "Mira"}, follow_redirects=False)
+    started = client.post(
+        "/combat/start",
+        data={
+            "enemies[0].name": "Shade",
+            "enemies[0].hp": "6",
+            "enemies[0].defense": "bad-value",
+        },
+    )
+    assert "Round 1" in started.text
+    assert "Shade" in started.text
+
+    acted = client.post(
+        "/combat/action", data={"action": "attack", "target": "Shade"}
+    )
+    assert acted.status_code == 200
+
+    ended = client.post("/combat/end")
+    assert "Start a fight" in ended.text
+
+
+def test_hashed_asset_immutable_cache(client):
+    page = client.get("/")
+    match = re.search(r'href="(/static/css/style\.[0-9a-f]{16}\.css)"', page.text)
+    assert match, page.text
+    response = client.get(match.group(1))
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
@@ -0,0 +1,115 @@
+// Hollow Host table client.
+document.addEventListener('DOMContentLoaded', () => {
+    const messageLog = document.getElementById('message-log');
+    const commandForm = document.getElementById('command-form');
+    const playerInput = document.getElementById('player-input');
+    const messageTemplate = document.getElementById('msg-tpl');
+
+    let scrollPending = false;
+    function scheduleScroll() {
+        // Coalesce scroll writes to one per frame; writing scrollTop after
+        // every append forces a synchronous layout pass.
+        if (scrollPending) { return; }
+        scrollPending = true;
+        requestAnimationFrame(() => {
+            messageLog.scrollTop = messageLog.scrollHeight;
+            scrollPending = false;
+        });
+    }
+
+    function addMessage(type, content) {
+        // Cloning a template node beats element-by-element construction.
+        const message = messageTemplate.content.firstElementChild.cloneNode(true);
+        message.classList.add(type + '-message');
+        message.firstElementChild.textContent = content;
+        messageLog.appendChild(message);
+        scheduleScroll();
+    }
+
+    // Streaming transport: tokens render as they arrive instead of the UI
+    // blocking on the full response. Falls back to POST when no socket.
+    let ws = null;
+    let currentMessage = null;
+    let currentChunks = [];
+
+    function openSocket() {
+        try {
+            const scheme = location.protocol === 'https:' ? 'wss://' : 'ws://';
+            ws = new WebSocket(scheme + location.host + '/ws');
+        } catch (err) {
+            ws = null;
+            return;
+        }
+        ws.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data.event === 'start') {
+                currentMessage = messageTemplate.content.firstElementChild.cloneNode(true);
+                currentMessage.classList.add((data.type || 'narrative') + '-message');
+                currentChunks = [];
+                messageLog.appendChild(currentMessage);
+            } else if (data.event === 'token' && currentMessage) {
+                // Appending a Text node is O(1); `textContent += token`
+                // recopies the whole accumulated string per token.
+                currentChunks.push(data.text);
+                currentMessage.firstElementChild.appendChild(
+                    document.createTextNode(data.text)
+                );
+                scheduleScroll();
+            } else if (data.event === 'end') {
+                if (currentMessage) {
+                    // Collapse the node pool into one string for memory.
+                    currentMessage.firstElementChild.textContent = currentChunks.join('');
+                }
+                currentMessage = null;
+                currentChunks = [];
+                scheduleScroll();
+            }
+        };
+        ws.onclose = () => { ws = null; };
+        ws.onerror = () => { ws = null; };
+    }
+
+    async function sendOverHttp(input) {
+        try {
+            const response = await fetch('/send', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ player_input: input })
+            });
+            // Narrative arrives as text/plain; only structured responses
+            // pay for JSON parsing.
+            const contentType = response.headers.get('content-type') || '';
+            const data = contentType.startsWith('application/json')
+                ? await response.json()
+                : { type: 'narrative', response: await response.text() };
+            addMessage(data.type || 'narrative', data.response);
+        } catch (err) {
+            addMessage('error', 'The connection to the host was lost.');
+        }
+    }
+
+    if (commandForm) {
+        commandForm.addEventListener('submit', (event) => {
+            event.preventDefault();
+            const input = playerInput.value.trim();
+            if (!input) { return; }
+            addMessage('player', input);
+            playerInput.value = '';
+            if (ws && ws.readyState === WebSocket.OPEN) {
+                ws.send(input);
+            } else {
+                sendOverHttp(input);
+            }
+        });
+    }
+
+    openSocket();
+
+    // Focus is not paint-critical: defer it past first paint instead of
+    // triggering a focus event + scroll-into-view during load.
+    if (playerInput && document.activeElement !== playerInput) {
+        (window.requestIdleCallback || ((cb) => setTimeout(cb, 1)))(
+            () => playerInput.focus()
+        );
+    }
+});
@@ -0,0 +1,757 @@
+"""The web table: FastAPI routes, templates and static assets."""
+
+import glob
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import random
+import stat
+import types
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Final
+
+import aiofiles
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:  # pragma: no cover - optional dependency
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:  # pragma: no cover - optional dependency
+    rjsmin = None
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import (
+    FileResponse,
+    ORJSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    Response,
+)
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+from pydantic import BaseModel
+from starlette.datastructures import Headers
+
+from characters.builder import CharacterBuilder
+from game.combat import CombatEngine
+from rules.loader import RulesetLoader
+
+log = logging.getLogger(__name__)
+
+UI_DIR = os.path.dirname(__file__)
+TEMPLATE_DIR = os.path.join(UI_DIR, "templates")
+STATIC_DIR = os.path.join(UI_DIR, "static")
+JINJA_CACHE_DIR = os.path.join(UI_DIR, ".jinja_cache")
+COMPILED_TEMPLATE_DIR = os.path.join(UI_DIR, "templates_compiled")
+
+# Checked-in text assets that get minified, precompressed siblings.
+_COMPRESSIBLE_ASSETS: Final = (
+    os.path.join(STATIC_DIR, "css", "style.css"),
+    os.path.join(STATIC_DIR, "js", "main.js"),
+)
+
+# Encodings we can serve from precompressed sibling files, best first.
+_PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Content-hashed asset aliases, e.g. "style.3f9ab2c4d1e05678.css".
+_HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{16}\.(?:css|js)$")
+
+# Indexed form keys, e.g. "enemies[0].hp" or "status_effects[2].name".
+_ENEMY_KEY_RE = re.compile(r"^enemies\[(\d+)\]\.(\w+)$")
+_STATUS_KEY_RE = re.compile(r"^status_effects\[(\d+)\]\.(\w+)$")
+
+def _minify_asset(name: str, content: bytes) -> bytes:
+    """Minify a static asset when the matching minifier is installed.
+
+    Runs once at setup to feed the precompressed siblings; the checked-in
+    sources stay readable. Falls back to the unminified content on any
+    failure.
+    """
+    try:
+        if name.endswith(".css") and rcssmin is not None:
+            return rcssmin.cssmin(content.decode("utf-8")).encode("utf-8")
+        if name.endswith(".js") and rjsmin is not None:
+            return rjsmin.jsmin(content.decode("utf-8")).encode("utf-8")
+    except Exception:
+        log.exception("Minification failed for %s", name)
+    return content
+
+
+def _safe_int(value, default: int) -> int:
+    """Parse an optional (possibly signed) integer field without raising."""
+    s = str(value) if value is not None else ""
+    # isdecimal, not isdigit: the latter accepts characters int() rejects
+    # (superscripts, circled digits), which would raise here.
+    if s and (s.isdecimal() or (s[:1] in "+-" and s[1:].isdecimal())):
+        return int(s)
+    return default
+
+
+# Character-sheet form fields, preformatted so no f-string runs per request.
+_STAT_KEYS = tuple(
+    (stat, f"stats.{stat}") for stat in ("STR", "DEX", "CON", "INT", "WIS", "CHA")
+)
+_SKILL_KEYS = tuple(
+    (skill, f"skills.{skill}") for skill in ("athletics", "stealth", "arcana")
+)
+
+# Frozen default combat payloads; MappingProxyType guards against handler
+# code mutating what is effectively a template constant.
+_INACTIVE_COMBAT = types.MappingProxyType({"active": False})
+_DUMMY_COMBAT_STATE = types.MappingProxyType(
+    {
+        "active": True,
+        "round": 1,
+        "turn": "party",
+        "combatants": (
+            {"name": "Adventurer", "side": "party", "hp": 10, "max_hp": 10,
+             "defense": 10, "effects": ()},
+            {"name": "Hollow Shade", "side": "enemies", "hp": 6, "max_hp": 6,
+             "defense": 9, "effects": ()},
+        ),
+        "log": ("The shade drifts closer.",),
+    }
+)
+
+def _compiled_templates_fresh() -> bool:
+    """True when every precompiled template module is newer than the sources."""
+    try:
+        compiled = [
+            os.path.getmtime(os.path.join(COMPILED_TEMPLATE_DIR, name))
+            for name in os.listdir(COMPILED_TEMPLATE_DIR)
+            if name.endswith((".py", ".pyc"))
+        ]
+        sources = [
+            os.path.getmtime(os.path.join(TEMPLATE_DIR, name))
+            for name in os.listdir(TEMPLATE_DIR)
+            if name.endswith(".html")
+        ]
+    except OSError:
+        return False
+    return bool(compiled) and bool(sources) and min(compiled) >= max(sources)
+
+
+def _build_template_env() -> Environment:
+    """Build the shared compile-once Jinja environment.
+
+    Templates are precompiled to Python modules under templates_compiled/
+    (recompiled only when a source changed) and served via ModuleLoader, so
+    startup skips the lex/parse stage entirely. auto_reload is off and a
+    FileSystemBytecodeCache backs the source environment used for
+    compilation.
+    """
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=FileSystemBytecodeCache(JINJA_CACHE_DIR),
+    )
+    try:
+        if not _compiled_templates_fresh():
+            env.compile_templates(COMPILED_TEMPLATE_DIR, zip=None, py_compile=True)
+        compiled_env = Environment(
+            loader=ModuleLoader(COMPILED_TEMPLATE_DIR),
+            autoescape=True,
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        compiled_env.get_template("index.html")
+        return compiled_env
+    except Exception:
+        log.exception("Falling back to source templates; precompile failed")
+        return env
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Starlette static serving plus precompressed variants and cache hints.
+
+    Delegating to ``StaticFiles`` keeps sendfile-backed responses, ETags,
+    If-Modified-Since and range support; this subclass only picks a .br/.gz
+    sibling when the client's Accept-Encoding allows one and marks
+    content-hashed filenames as immutable.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = None
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        for encoding, suffix in _PRECOMPRESSED_ENCODINGS:
+            if encoding not in accept_encoding:
+                continue
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["content-encoding"] = encoding
+                response.headers["vary"] = "Accept-Encoding"
+                media_type = mimetypes.guess_type(path)[0]
+                if media_type:
+                    response.headers["content-type"] = media_type
+                break
+        if response is None:
+            response = await super().get_response(path, scope)
+        if _HASHED_ASSET_RE.search(path):
+            response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+class SendRequest(BaseModel):
+    """JSON body of a table command posted from the client."""
+
+    player_input: str = ""
+
+
+COMMANDS: Final = [
+    {"name": "look", "description": "Describe your surroundings."},
+    {"name": "go <direction>", "description": "Travel in a direction."},
+    {"name": "roll <dice>", "description": "Roll dice, e.g. `roll d20`."},
+    {"name": "talk <name>", "description": "Strike up a conversation."},
+    {"name": "help", "description": "Show this command list."},
+]
+
+
+class WebUI:
+    """Builds the FastAPI application and owns all route handlers."""
+
+    def __init__(self):
+        self.app = FastAPI(title="Hollow Host", default_response_class=ORJSONResponse)
+        self.prepare_static_assets()
+        env = _build_template_env()
+        # Warm the template cache so no request pays load cost.
+        try:
+            names = env.list_templates()
+        except TypeError:  # ModuleLoader cannot enumerate templates
+            names = [n for n in os.listdir(TEMPLATE_DIR) if n.endswith(".html")]
+        for name in names:
+            env.get_template(name)
+        env.globals["asset_urls"] = self._hashed_assets
+        # Early-hint the critical assets so fetches start before the parser
+        # reaches the tags; formatted once, not per response.
+        css_url = self._hashed_assets["style.css"]
+        js_url = self._hashed_assets["main.js"]
+        self._preload_css = f"<{css_url}>; rel=preload; as=style"
+        self._preload_index = (
+            f"{self._preload_css}, <{js_url}>; rel=preload; as=script"
+        )
+        self.templates = Jinja2Templates(env=env)
+        # One builder for every handler so its mtime-memoized roster listing
+        # actually survives across requests.
+        self._builder = CharacterBuilder()
+        self._render_static_pages(env)
+        self._register_routes()
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def prepare_static_assets(self):
+        """Create the writable asset directories and refresh compressed siblings.
+
+        Templates and static sources are checked-in files served in place;
+        startup only ensures the upload directory exists and the
+        precompressed variants are current — no asset bytes are copied.
+        """
+        os.makedirs(os.path.join(STATIC_DIR, "images", "characters"), exist_ok=True)
+        self._hashed_assets = self._hash_static_assets()
+        self._precompress_assets()
+
+    def _hash_static_assets(self) -> dict:
+        """Write content-hashed aliases of the text assets.
+
+        The alias name changes whenever the content does, which makes a
+        far-future immutable Cache-Control safe: repeat visitors reuse
+        cached copies without even a conditional GET. Returns a mapping of
+        source basename to alias URL, exposed to templates as
+        ``asset_urls``.
+        """
+        urls = {}
+        self._hashed_paths = []
+        for source in _COMPRESSIBLE_ASSETS:
+            with open(source, "rb") as f:
+                content = _minify_asset(source, f.read())
+            digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+            base, ext = os.path.splitext(source)
+            hashed = f"{base}.{digest}{ext}"
+            if not os.path.exists(hashed):
+                Path(hashed).write_bytes(content)
+            # Drop aliases (and their compressed siblings) from older builds.
+            for stale in glob.glob(f"{base}.????????????????{ext}*"):
+                if not stale.startswith(hashed):
+                    os.remove(stale)
+            self._hashed_paths.append(hashed)
+            urls[os.path.basename(source)] = (
+                "/static/"
+                + os.path.relpath(hashed, STATIC_DIR).replace(os.sep, "/")
+            )
+        return urls
+
+    def _precompress_assets(self):
+        """Write minified .gz/.br siblings next to the text assets.
+
+        Minification and compression run once at setup instead of per
+        response; the static route serves whichever sibling the client's
+        Accept-Encoding allows, and clients without either get the readable
+        source file. Every stale target is a distinct inode, so the
+        compress-and-write jobs run concurrently on a small thread pool
+        (gzip and brotli release the GIL while compressing) and each lands
+        as a single ``Path.write_bytes`` call.
+        """
+        jobs = []
+        for destination in (*_COMPRESSIBLE_ASSETS, *self._hashed_paths):
+            with open(destination, "rb") as f:
+                content = _minify_asset(destination, f.read())
+            source_mtime = os.path.getmtime(destination)
+            targets = [(destination + ".gz", lambda c: gzip.compress(c, 9))]
+            if brotli is not None:
+                targets.append(
+                    (destination + ".br", lambda c: brotli.compress(c, quality=11))
+                )
+            for target, compress in targets:
+                try:
+                    if os.path.getmtime(target) >= source_mtime:
+                        continue
+                except OSError:
+                    pass
+                jobs.append((Path(target), compress, content))
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            list(pool.map(lambda job: job[0].write_bytes(job[1](job[2])), jobs))
+
+    def _render_static_pages(self, env):
+        """Render and precompress pages that have no per-request variables.
+
+        The help page only iterates the COMMANDS constant, so it is rendered
+        exactly once here; requests then send a cached (ideally compressed)
+        buffer and never touch Jinja.
+        """
+        html = env.get_template("help.html").render(commands=COMMANDS).encode("utf-8")
+        self._help_page = {None: html, "gzip": gzip.compress(html, 9)}
+        if brotli is not None:
+            self._help_page["br"] = brotli.compress(html, quality=11)
+
+    def _register_routes(self):
+        app = self.app
+        app.get("/")(self.render_index)
+        app.post("/send")(self.send_command)
+        app.websocket("/ws")(self.websocket_table)
+        app.get("/help")(self.render_help)
+        app.get("/character")(self.render_character_creation)
+        app.post("/character")(self.process_character_creation)
+        app.get("/rulesets")(self.render_ruleset_builder)
+        app.post("/rulesets")(self.process_ruleset_creation)
+        app.post("/rulesets/upload")(self.process_ruleset_upload)
+        app.get("/rulesets/view/{filename}")(self.render_view_ruleset)
+        app.get("/rulesets/download/{filename}")(self.download_ruleset_file)
+        app.post("/rulesets/delete/{filename}")(self.delete_ruleset_file)
+        app.get("/combat")(self.render_combat)
+        app.post("/combat/start")(self.process_start_combat)
+        app.post("/combat/action")(self.process_combat_action)
+        app.post("/combat/end")(self.process_end_combat)
+        app.mount(
+            "/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static"
+        )
+
+    # ------------------------------------------------------------------
+    # Table
+    # ------------------------------------------------------------------
+
+    def render_index(self, request: Request):
+        return self.templates.TemplateResponse(
+            request,
+            "index.html",
+            {"greeting": "The lantern gutters. The Hollow Host is listening."},
+            headers={"Link": self._preload_index},
+        )
+
+    async def send_command(self, message: SendRequest):
+        # JSON body + compiled pydantic validation skips the form-decoding
+        # path entirely.
+        payload = self._handle_command(message.player_input.strip())
+        if payload["type"] == "narrative":
+            # Pure narrative is just a string; text/plain lets the client
+            # skip JSON parsing on potentially large responses.
+            return PlainTextResponse(payload["response"])
+        return payload
+
+    async def websocket_table(self, websocket: WebSocket):
+        """Stream command responses token-by-token over one socket.
+
+        Each player line produces a start frame (carrying the message type),
+        a token frame per chunk, and an end frame, so the client can render
+        incrementally instead of waiting for the full response.
+        """
+        await websocket.accept()
+        try:
+            while True:
+                player_input = (await websocket.receive_text()).strip()
+                payload = self._handle_command(player_input)
+                await websocket.send_json({"event": "start", "type": payload["type"]})
+                for token in self._stream_tokens(payload["response"]):
+                    await websocket.send_json({"event": "token", "text": token})
+                await websocket.send_json({"event": "end"})
+        except WebSocketDisconnect:
+            pass
+
+    @staticmethod
+    def _stream_tokens(text: str):
+        """Yield a response in word-sized chunks, preserving spacing."""
+        words = text.split(" ")
+        last = len(words) - 1
+        for i, word in enumerate(words):
+            yield word if i == last else word + " "
+
+    def _handle_command(self, player_input: str) -> dict:
+        """Resolve one table command into a response payload."""
+        lowered = player_input.lower()
+        if not lowered:
+            return {"type": "system", "response": "Silence is also an answer."}
+        if lowered == "help":
+            listing = "; ".join(f"{c['name']} — {c['description']}" for c in COMMANDS)
+            return {"type": "system", "response": listing}
+        if lowered.startswith("roll"):
+            sides = 20
+            parts = lowered.split()
+            if len(parts) > 1 and parts[1].startswith("d"):
+                sides = _safe_int(parts[1][1:], 20)
+            return {
+                "type": "system",
+                "response": f"You roll a d{sides}: {random.randint(1, max(sides, 1))}.",
+            }
+        if lowered == "look":
+            return {
+                "type": "narrative",
+                "response": (
+                    "Mist pools between crooked lamp posts. Somewhere beyond the "
+                    "tree line, something answers your breathing."
+                ),
+            }
+        return {
+            "type": "narrative",
+            "response": f'The host considers "{player_input}" and nods slowly.',
+        }
+
+    def render_help(self, request: Request):
+        accept_encoding = request.headers.get("accept-encoding", "")
+        headers = {
+            "Cache-Control": "public, max-age=86400",
+            "Vary": "Accept-Encoding",
+            "Link": self._preload_css,
+        }
+        for encoding, _ in _PRECOMPRESSED_ENCODINGS:
+            body = self._help_page.get(encoding)
+            if body is not None and encoding in accept_encoding:
+                headers["Content-Encoding"] = encoding
+                return Response(body, media_type="text/html", headers=headers)
+        return Response(
+            self._help_page[None], media_type="text/html", headers=headers
+        )
+
+    # ------------------------------------------------------------------
+    # Characters
+    # ------------------------------------------------------------------
+
+    def render_character_creation(self, request: Request, error: str = None):
+        return self.templates.TemplateResponse(
+            request,
+            "character.html",
+            {"characters": self._builder.list_characters(), "error": error},
+        )
+
+    async def process_character_creation(self, request: Request):
+        form = await request.form()
+        name = str(form.get("name", "")).strip()
+        if not name:
+            return self.render_character_creation(request, error="A name is required.")
+        ancestry = str(form.get("ancestry", "human"))
+        char_class = str(form.get("char_class", "wanderer"))
+
+        stats = {}
+        for stat, key in _STAT_KEYS:
+            stats[stat] = _safe_int(form.get(key), 10)
+
+        skills = {}
+        for skill, key in _SKILL_KEYS:
+            skills[skill] = _safe_int(form.get(key), 0)
+
+        portrait = None
+        character_image = form.get("character_image")
+        if character_image is not None and getattr(character_image, "filename", ""):
+            filename = character_image.filename
+            head, sep, ext = filename.rpartition(".")
+            ext = ext.lower() if sep else "png"
+            if ext not in {"png", "jpg", "jpeg", "webp", "gif"}:
+                ext = "png"
+            image_name = f"{name.replace(' ', '_').lower()}.{ext}"
+            image_path = os.path.join(STATIC_DIR, "images", "characters", image_name)
+            try:
+                content = await character_image.read()
+                with open(image_path, "wb") as f:
+                    f.write(content)
+                portrait = f"/static/images/characters/{image_name}"
+            except Exception:
+                log.exception("Error saving character image")
+
+        self._builder.create_character(
+            name=name,
+            ancestry=ancestry,
+            char_class=char_class,
+            stats=stats,
+            skills=skills,
+            portrait=portrait,
+        )
+        return RedirectResponse(url="/character", status_code=303)
+
+    # ------------------------------------------------------------------
+    # Rulesets
+    # ------------------------------------------------------------------
+
+    def _get_rulesets(self, loader) -> dict:
+        """Return ``{"all": (...), "templates": (...)}``, cached by dir mtime.
+
+        The template filter runs during the directory walk, so the per-request
+        list comprehension (and its second list allocation) is gone; cache
+        hits hand both tuples back with two dict lookups.
+        """
+        try:
+            mtime = os.stat(loader.rules_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = getattr(self, "_ruleset_cache", None)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        rulesets = loader.list_rulesets()
+        entry = {
+            "all": tuple(rulesets),
+            "templates": tuple(r for r in rulesets if r["type"] == "template"),
+        }
+        self._ruleset_cache = (mtime, entry)
+        return entry
+
+    def render_ruleset_builder(self, request: Request, error: str = None):
+        rulesets = self._get_rulesets(RulesetLoader())
+        return self.templates.TemplateResponse(
+            request,
+            "ruleset_builder.html",
+            {
+                "rulesets": rulesets["all"],
+                "templates": rulesets["templates"],
+                "error": error,
+            },
+        )
+
+    async def process_ruleset_creation(self, request: Request):
+        form_data = await request.form()
+        name = str(form_data.get("name", "")).strip()
+        template = str(form_data.get("template", ""))
+        if not name or not template:
+            return self.render_ruleset_builder(
+                request, error="A name and base template are required."
+            )
+        description = str(form_data.get("description", ""))
+        version = str(form_data.get("version", "1.0"))
+
+        # Only categories that actually received input are added, so the
+        # loader's deep-merge never walks untouched sections of the template.
+        modifications = {"name": name, "description": description, "version": version}
+
+        # Snapshot the multidict once; each items() call would build a new list.
+        items = (
+            list(form_data.multi_items())
+            if hasattr(form_data, "multi_items")
+            else list(form_data.items())
+        )
+
+        for key, raw in items:
+            if key.startswith("checks."):
+                skill = key.split(".", 1)[1]
+                value = str(raw).strip()
+                if value:
+                    modifications.setdefault("checks", {})[skill] = value
+
+        for key, raw in items:
+            if key.startswith("combat."):
+                field = key.split(".", 1)[1]
+                value = str(raw).strip()
+                if value:
+                    if value.isdecimal() or (value[:1] in "+-" and value[1:].isdecimal()):
+                        modifications.setdefault("combat", {})[field] = int(value)
+                    else:
+                        modifications.setdefault("combat", {})[field] = value
+
+        for key, raw in items:
+            if key.startswith("difficulty_classes."):
+                level = key.split(".", 1)[1]
+                value = str(raw).strip()
+                if value.isdecimal():
+                    modifications.setdefault("difficulty_classes", {})[level] = int(value)
+
+        effects = defaultdict(dict)
+        for key, raw in items:
+            m = _STATUS_KEY_RE.match(key)
+            if not m:
+                continue
+            value = str(raw).strip()
+            if value:
+                effects[int(m.group(1))][m.group(2)] = value
+        for index in sorted(effects):
+            effect = effects[index]
+            if "name" in effect:
+                effect["duration"] = _safe_int(effect.get("duration"), 1)
+                modifications.setdefault("status_effects", []).append(effect)
+
+        loader = RulesetLoader()
+        loader.create_ruleset_from_template(template, modifications)
+        return RedirectResponse(url="/rulesets", status_code=303)
+
+    async def process_ruleset_upload(self, request: Request):
+        form = await request.form()
+        upload = form.get("ruleset_file")
+        if upload is None or not getattr(upload, "filename", ""):
+            return self.render_ruleset_builder(request, error="No file was uploaded.")
+        content = await upload.read()
+        loader = RulesetLoader()
+        try:
+            filepath = loader.validate_upload(upload.filename, content)
+        except Exception:
+            filepath = None
+        if filepath is None:
+            return self.render_ruleset_builder(
+                request, error="That file is not a valid ruleset."
+            )
+        async with aiofiles.open(filepath, "wb") as f:
+            await f.write(content)
+        return RedirectResponse(url="/rulesets", status_code=303)
+
+    async def render_view_ruleset(self, request: Request, filename: str):
+        loader = RulesetLoader()
+        filepath = os.path.join(loader.rules_dir, os.path.basename(filename))
+        try:
+            async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
+                yaml_content = await f.read()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Ruleset not found")
+        return self.templates.TemplateResponse(
+            request,
+            "view_ruleset.html",
+            {"filename": os.path.basename(filename), "yaml_content": yaml_content},
+        )
+
+    @staticmethod
+    def _ruleset_path(filename: str) -> str:
+        """Resolve a ruleset filename inside the rules directory.
+
+        Returns None when the resolved path would escape the rules
+        directory (symlink or traversal attempts).
+        """
+        rules_dir = os.path.realpath(RulesetLoader().rules_dir)
+        filepath = os.path.realpath(
+            os.path.join(rules_dir, os.path.basename(filename))
+        )
+        if os.path.commonpath([filepath, rules_dir]) != rules_dir:
+            return None
+        return filepath
+
+    def download_ruleset_file(self, filename: str):
+        filepath = self._ruleset_path(filename)
+        # isfile is a single stat() and rejects directories in the same call.
+        if filepath is None or not os.path.isfile(filepath):
+            raise HTTPException(status_code=404, detail="Ruleset not found")
+        return FileResponse(
+            filepath, media_type="application/x-yaml", filename=os.path.basename(filename)
+        )
+
+    def delete_ruleset_file(self, request: Request, filename: str):
+        filepath = self._ruleset_path(filename)
+        if filepath is None:
+            return self.render_ruleset_builder(request, error="Ruleset file not found.")
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            return self.render_ruleset_builder(request, error="Ruleset file not found.")
+        return RedirectResponse(url="/rulesets", status_code=303)
+
+    # ------------------------------------------------------------------
+    # Combat
+    # ------------------------------------------------------------------
+
+    def render_combat(self, request: Request, combat_state: dict = None, error: str = None):
+        if combat_state is None:
+            combat_state = _INACTIVE_COMBAT
+        return self.templates.TemplateResponse(
+            request,
+            "combat.html",
+            {"combat_state": combat_state, "error": error},
+        )
+
+    async def process_start_combat(self, request: Request):
+        form = await request.form()
+        enemies = []
+        enemy_fields = defaultdict(dict)
+        for key in form.keys():
+            m = _ENEMY_KEY_RE.match(key)
+            if not m:
+                continue
+            enemy_fields[int(m.group(1))][m.group(2)] = str(form[key]).strip()
+        for index in sorted(enemy_fields):
+            fields = enemy_fields[index]
+            if not fields.get("name"):
+                continue
+            enemies.append(
+                {
+                    "name": fields["name"],
+                    "hp": _safe_int(fields.get("hp"), 5),
+                    "defense": _safe_int(fields.get("defense"), 10),
+                }
+            )
+
+        if not enemies:
+            return self.render_combat(request, error="Add at least one enemy.")
+
+        character = self._builder.get_first_character()
+        if character is None:
+            return self.render_combat(
+                request, error="Create a character before starting combat."
+            )
+        engine = CombatEngine()
+        state = engine.start_combat(character, enemies)
+        self._combat_engine = engine
+        return self.render_combat(request, combat_state=state)
+
+    async def process_combat_action(self, request: Request):
+        form = await request.form()
+        engine = getattr(self, "_combat_engine", None)
+        if engine is not None and engine.state.get("active"):
+            actor = str(form.get("actor", "")) or engine.state["combatants"][0]["name"]
+            action = str(form.get("action", "attack"))
+            target = form.get("target")
+            state = engine.resolve_action(actor, action, str(target) if target else None)
+            return self.render_combat(request, combat_state=state)
+        return self.render_combat(request, combat_state=_DUMMY_COMBAT_STATE)
+
+    async def process_end_combat(self, request: Request):
+        engine = getattr(self, "_combat_engine", None)
+        if engine is not None:
+            engine.end_combat()
+        return self.render_combat(request, combat_state=_INACTIVE_COMBAT)
+
+
+def create_app() -> FastAPI:
+    """Application factory used by ``main.py`` and the tests."""
+    return WebUI().app